@@ -1,13 +1,35 @@
+import time
+
+# Taken before any other import so time-to-first-frame covers everything after interpreter startup
+PROCESS_START = time.perf_counter()
+
 import tkinter as tk
-from PIL import Image, ImageTk
-import cv2
-import requests
 import json
 import os
-import time
-from threading import Thread
+from threading import Thread, Lock
 import logging
-import numpy as np
+
+# Heavy modules are imported on first use so the window comes up as early as possible
+cv2 = None
+requests = None
+Image = None
+ImageTk = None
+
+def load_video_modules():
+    """Import cv2 and PIL on first use"""
+    global cv2, Image, ImageTk
+    if cv2 is None:
+        import cv2 as _cv2
+        from PIL import Image as _Image, ImageTk as _ImageTk
+        Image, ImageTk = _Image, _ImageTk
+        cv2 = _cv2
+
+def load_network_modules():
+    """Import requests on first use"""
+    global requests
+    if requests is None:
+        import requests as _requests
+        requests = _requests
 
 class VideoPlayer:
     def __init__(self, root):
@@ -26,6 +48,9 @@ class VideoPlayer:
         self.current_video_path = None
         self.cap = None
         self.is_playing = False
+        self.state_lock = Lock()
+        self.first_frame_logged = False
+        self.last_saved_at = 0
         
         # Basic logging
         logging.basicConfig(filename='ad_player.log', level=logging.INFO)
@@ -36,7 +61,15 @@ class VideoPlayer:
             'backend_url': 'http://localhost:5000/update-location',
             'request_interval': 5,
             'video_base_path': '/media/deeks/New Volume/Projects/Neer/mytest/frontend/clients',
-            'vehicle_id': 'CAB001'
+            'vehicle_id': 'CAB001',
+            'state_file': '/media/deeks/New Volume/Projects/Neer/mytest/frontend/last_state.json',
+            # The snapshot only covers the gap until the first poll corrects it, so a
+            # wrong resume costs one request_interval. The cutoff keeps a kiosk that
+            # was off for days from replaying an ad from an old route; 24 hours still
+            # covers an overnight power-off. Set to None to always resume.
+            'state_max_age': 24 * 60 * 60,
+            # How often an unchanged but confirmed ad refreshes the snapshot's saved_at
+            'state_refresh_interval': 60
         }
         
         # Start threads
@@ -49,9 +82,63 @@ class VideoPlayer:
         # Bind escape key
         self.root.bind('<Escape>', lambda e: self.cleanup_and_exit())
 
+    def restore_state(self):
+        """Load the last saved client/ad snapshot and start playing it"""
+        try:
+            with open(self.config['state_file'], 'r') as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logging.error(f"Error reading saved state: {e}")
+            return
+
+        if not isinstance(state, dict):
+            logging.error("Ignoring saved state: not a JSON object")
+            return
+
+        saved_at = state.get('saved_at')
+        if not isinstance(saved_at, (int, float)):
+            return
+        max_age = self.config['state_max_age']
+        if max_age is not None and time.time() - saved_at > max_age:
+            logging.info("Ignoring stale saved state")
+            return
+
+        current_ad = state.get('current_ad')
+        video_path = state.get('video_path')
+        if not (isinstance(current_ad, str) and isinstance(video_path, str) and os.path.exists(video_path)):
+            return
+
+        with self.state_lock:
+            # A location update may already have picked an ad; that one wins
+            if self.current_ad is None:
+                self.current_ad = current_ad
+                self.play_video(video_path)
+                self.last_saved_at = saved_at
+                logging.info(f"Resumed saved ad: {current_ad}")
+
+    def save_state(self):
+        """Persist the current client/ad snapshot for the next boot"""
+        saved_at = time.time()
+        state = {
+            'current_ad': self.current_ad,
+            'video_path': self.current_video_path,
+            'saved_at': saved_at
+        }
+        tmp_path = self.config['state_file'] + '.tmp'
+        try:
+            with open(tmp_path, 'w') as file:
+                json.dump(state, file)
+            os.replace(tmp_path, self.config['state_file'])
+            self.last_saved_at = saved_at
+        except Exception as e:
+            logging.error(f"Error saving state: {e}")
+
     def play_video(self, video_path):
         """Start playing a new video"""
         if video_path != self.current_video_path:
+            load_video_modules()
             if self.cap is not None:
                 self.cap.release()
             
@@ -62,15 +149,25 @@ class VideoPlayer:
 
     def play_loop(self):
         """Main video playback loop"""
+        # Resume the last known ad here so the heavy imports stay off the Tk startup path
+        try:
+            self.restore_state()
+        except Exception as e:
+            logging.error(f"Error restoring saved state: {e}")
+
         while self.keep_running:
             if self.is_playing and self.cap is not None:
+                # Wait until the window is mapped and has its real size
+                screen_width = self.root.winfo_width()
+                screen_height = self.root.winfo_height()
+                if not self.root.winfo_ismapped() or screen_width <= 1 or screen_height <= 1:
+                    time.sleep(1/60)
+                    continue
+
                 ret, frame = self.cap.read()
                 
                 if ret:
                     # Resize frame to fit screen
-                    screen_width = self.root.winfo_width()
-                    screen_height = self.root.winfo_height()
-                    
                     frame = cv2.resize(frame, (screen_width, screen_height))
                     frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
                     
@@ -83,12 +180,20 @@ class VideoPlayer:
                     self.canvas.create_image(0, 0, image=photo, anchor=tk.NW)
                     self.canvas.image = photo  # Keep a reference
                     
+                    if not self.first_frame_logged:
+                        self.first_frame_logged = True
+                        elapsed = time.perf_counter() - PROCESS_START
+                        logging.info(f"Time to first frame since process start: {elapsed:.3f}s")
+                    
                 else:
                     # Video ended, restart from beginning
                     self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
                 
                 # Control frame rate
                 time.sleep(1/60)  # Limit to 30 FPS
+            else:
+                # Nothing to play yet; don't compete with Tk for the GIL
+                time.sleep(0.1)
 
     def send_location_update(self):
         """Send location update to backend"""
@@ -101,6 +206,7 @@ class VideoPlayer:
                 "gps_data": gps_data
             }
             
+            load_network_modules()
             response = requests.post(
                 self.config['backend_url'],
                 json=payload,
@@ -129,16 +235,26 @@ class VideoPlayer:
             
         return os.path.join(client_dir, videos[0])
 
+    def handle_location_update(self, new_ad):
+        """Switch to a new ad, or refresh the snapshot when the current one is confirmed"""
+        if new_ad != self.current_ad:
+            video_path = self.get_video_path(new_ad)
+            if video_path:
+                with self.state_lock:
+                    self.current_ad = new_ad
+                    self.play_video(video_path)
+                    self.save_state()
+        elif time.time() - self.last_saved_at >= self.config['state_refresh_interval']:
+            with self.state_lock:
+                self.save_state()
+
     def location_update_loop(self):
         """Check for location updates"""
         while self.keep_running:
             try:
                 new_ad = self.send_location_update()
-                if new_ad and new_ad != self.current_ad:
-                    video_path = self.get_video_path(new_ad)
-                    if video_path:
-                        self.current_ad = new_ad
-                        self.play_video(video_path)
+                if new_ad:
+                    self.handle_location_update(new_ad)
                 time.sleep(self.config['request_interval'])
             except Exception as e:
                 logging.error(f"Error in location update: {e}")
@@ -152,14 +268,6 @@ class VideoPlayer:
         self.root.destroy()
 
 def main():
-    # Install required packages if not already installed
-    try:
-        import cv2
-    except ImportError:
-        print("Installing required packages...")
-        os.system('pip install opencv-python pillow')
-        import cv2
-
     root = tk.Tk()
     app = VideoPlayer(root)
     root.mainloop()
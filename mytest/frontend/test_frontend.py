@@ -0,0 +1,109 @@
+import json
+import time
+from threading import Lock
+
+import pytest
+
+import frontend
+
+
+def make_player(tmp_path):
+    """Build a VideoPlayer without a Tk window or worker threads"""
+    player = frontend.VideoPlayer.__new__(frontend.VideoPlayer)
+    player.current_ad = None
+    player.current_video_path = None
+    player.state_lock = Lock()
+    player.last_saved_at = 0
+    player.config = {
+        'state_file': str(tmp_path / 'last_state.json'),
+        'state_max_age': 60,
+        'state_refresh_interval': 10
+    }
+    player.played = []
+    player.play_video = player.played.append
+    return player
+
+
+def test_save_and_restore_round_trip(tmp_path):
+    video = tmp_path / 'ad.mp4'
+    video.write_bytes(b'')
+
+    saved = make_player(tmp_path)
+    saved.current_ad = 'Sharath City Capital Mall'
+    saved.current_video_path = str(video)
+    saved.save_state()
+
+    restored = make_player(tmp_path)
+    restored.restore_state()
+    assert restored.current_ad == 'Sharath City Capital Mall'
+    assert restored.played == [str(video)]
+    assert not (tmp_path / 'last_state.json.tmp').exists()
+
+
+@pytest.mark.parametrize('contents', [
+    None,
+    '{not json',
+    '[]',
+    '"a string"',
+    'null',
+])
+def test_restore_ignores_missing_or_corrupt_state(tmp_path, contents):
+    if contents is not None:
+        (tmp_path / 'last_state.json').write_text(contents)
+
+    player = make_player(tmp_path)
+    player.restore_state()
+    assert player.current_ad is None
+    assert player.played == []
+
+
+def test_restore_ignores_stale_state(tmp_path):
+    video = tmp_path / 'ad.mp4'
+    video.write_bytes(b'')
+    (tmp_path / 'last_state.json').write_text(json.dumps({
+        'current_ad': 'SVM Hotel',
+        'video_path': str(video),
+        'saved_at': time.time() - 120
+    }))
+
+    player = make_player(tmp_path)
+    player.restore_state()
+    assert player.current_ad is None
+    assert player.played == []
+
+
+def test_confirmed_ad_refreshes_snapshot(tmp_path):
+    video = tmp_path / 'ad.mp4'
+    video.write_bytes(b'')
+    # The ad last changed well past state_max_age ago
+    (tmp_path / 'last_state.json').write_text(json.dumps({
+        'current_ad': 'SVM Hotel',
+        'video_path': str(video),
+        'saved_at': time.time() - 120
+    }))
+
+    player = make_player(tmp_path)
+    player.current_ad = 'SVM Hotel'
+    player.current_video_path = str(video)
+    player.last_saved_at = time.time() - 120
+    player.handle_location_update('SVM Hotel')
+
+    restored = make_player(tmp_path)
+    restored.restore_state()
+    assert restored.current_ad == 'SVM Hotel'
+    assert restored.played == [str(video)]
+
+
+def test_restore_without_max_age(tmp_path):
+    video = tmp_path / 'ad.mp4'
+    video.write_bytes(b'')
+    (tmp_path / 'last_state.json').write_text(json.dumps({
+        'current_ad': 'SVM Hotel',
+        'video_path': str(video),
+        'saved_at': time.time() - 7 * 24 * 60 * 60
+    }))
+
+    player = make_player(tmp_path)
+    player.config['state_max_age'] = None
+    player.restore_state()
+    assert player.current_ad == 'SVM Hotel'